@@ -1,19 +1,55 @@
 from __future__ import annotations
 
-from typing import Annotated, List
+import copy
+from array import array
+from functools import lru_cache
+from typing import Annotated, List, Tuple
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict, HttpUrl, field_validator
+import pydantic_core
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    Field,
+    ConfigDict,
+    HttpUrl,
+    PlainSerializer,
+    TypeAdapter,
+    WithJsonSchema,
+    field_validator,
+    model_validator,
+)
 
 # ---------- Common constrained scalars ----------
 Percentage = Annotated[float, Field(ge=0, le=100, description="0–100 percentage")]
 NonNegativeNumber = Annotated[float, Field(ge=0, description="Non-negative number")]
 Ratio01 = Annotated[float, Field(ge=0, le=1, description="Ratio in [0, 1]")]
+# Stored as a tuple (write-once), but dumped as a list like the other array fields.
+StrTuple = Annotated[Tuple[str, ...], PlainSerializer(list, return_type=List[str])]
 
 # Optional: a permissive ISO-8601 duration pattern for strings like 'PT2H', 'P3D', etc.
-ISO_DURATION_PATTERN = r"^P(?=.*[T\d])(?:\d+Y)?(?:\d+M)?(?:\d+D)?(?:T(?:\d+H)?(?:\d+M)?(?:\d+S)?)?$"
+# Written without look-around so pydantic-core can run it on its native Rust regex
+# engine, which guarantees linear-time matching (no backtracking on hostile input).
+# Each alternative starts with a component, so a bare 'P' is still rejected.
+_ISO_TIME = r"T(?:\d+H)?(?:\d+M)?(?:\d+S)?"
+ISO_DURATION_PATTERN = (
+    r"^P(?:"
+    rf"\d+Y(?:\d+M)?(?:\d+D)?(?:{_ISO_TIME})?"
+    rf"|\d+M(?:\d+D)?(?:{_ISO_TIME})?"
+    rf"|\d+D(?:{_ISO_TIME})?"
+    rf"|{_ISO_TIME}"
+    r")$"
+)
+
+_SENTENCE_TERMINATORS = frozenset(".!?")
+_FORBIDDEN_HOSTS = frozenset({"psychonautwiki.org", "www.psychonautwiki.org"})
+
+IsoDuration = Annotated[str, Field(pattern=ISO_DURATION_PATTERN)]
 
 
 # ---------- Enums ----------
+# Enum-typed fields are left to pydantic-core's native value lookup. Python-level
+# {value: member} BeforeValidators measured no faster on scalar fields and roughly
+# 2x slower on List[CategoryEnum].
 class DurationUnits(str, Enum):
     hours = "hours"
     minutes = "minutes"
@@ -75,23 +111,35 @@ class DurationRange(BaseModel):
     model_config = ConfigDict(extra="forbid")
     min: float = Field(description="Minimum duration value")
     max: float = Field(description="Maximum duration value")
-    iso: List[Annotated[str, Field(pattern=ISO_DURATION_PATTERN)]] = Field(
+    iso: List[IsoDuration] = Field(
         description="ISO 8601 duration format representations"
     )
     note: str = Field(description="Additional notes about the duration")
 
+    @model_validator(mode="after")
+    def _min_not_above_max(self) -> DurationRange:
+        if not self.min <= self.max:
+            raise ValueError("min must be a number no greater than max")
+        return self
+
 
 class DurationPhase(BaseModel):
     model_config = ConfigDict(extra="forbid")
     start: float = Field(description="Start time of this phase")
     end: float = Field(description="End time of this phase")
-    iso_start: List[Annotated[str, Field(pattern=ISO_DURATION_PATTERN)]] = Field(
+    iso_start: List[IsoDuration] = Field(
         description="ISO 8601 duration format for start time"
     )
-    iso_end: List[Annotated[str, Field(pattern=ISO_DURATION_PATTERN)]] = Field(
+    iso_end: List[IsoDuration] = Field(
         description="ISO 8601 duration format for end time"
     )
 
+    @model_validator(mode="after")
+    def _start_not_after_end(self) -> DurationPhase:
+        if not self.start <= self.end:
+            raise ValueError("start must be a number no greater than end")
+        return self
+
 
 class DurationCurveData(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -111,7 +159,7 @@ class DurationCurveEntry(BaseModel):
 
 
 class DoseRanges(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
     threshold: str = Field(description="Threshold dose.")
     light: str = Field(description="Light dose.")
     common: str = Field(description="Common dose.")
@@ -156,10 +204,10 @@ class DurationSummary(BaseModel):
 
 
 class Interactions(BaseModel):
-    model_config = ConfigDict(extra="forbid")
-    dangerous: List[str] = Field(description="Dangerous drug interactions.")
-    unsafe: List[str] = Field(description="Unsafe drug interactions.")
-    caution: List[str] = Field(description="Interactions that require caution.")
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    dangerous: StrTuple = Field(description="Dangerous drug interactions.")
+    unsafe: StrTuple = Field(description="Unsafe drug interactions.")
+    caution: StrTuple = Field(description="Interactions that require caution.")
 
 
 class ToleranceModel(BaseModel):
@@ -177,8 +225,88 @@ class ToleranceTimelinePoint(BaseModel):
     confidence: Percentage = Field(description="Confidence level in this data point (0-100)")
 
 
+_FLOAT_LIST_ADAPTER: TypeAdapter[List[float]] = TypeAdapter(List[float])
+
+
+def _as_float_column(v):
+    # Always copy, so the caller cannot change a validated column through its own array.
+    if isinstance(v, array) and v.typecode == "d":
+        return array("d", v)
+    # array("d", b"...") would reinterpret raw bytes as doubles
+    if isinstance(v, (str, bytes, bytearray)):
+        raise ValueError("expected a sequence of numbers")
+    # same lax float coercion as ToleranceTimelinePoint (e.g. "1.5" -> 1.5)
+    return array("d", _FLOAT_LIST_ADAPTER.validate_python(v))
+
+
+FloatColumn = Annotated[
+    array,
+    BeforeValidator(_as_float_column),
+    PlainSerializer(list, return_type=List[float], when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
+
+
+class ToleranceTimelineSoA(BaseModel):
+    """
+    Column-oriented alternative to List[ToleranceTimelinePoint] for long timelines.
+
+    Each column is a packed array('d'), i.e. 24 bytes per point instead of one model
+    instance per point. Accepts either the three columns or a list of timeline points.
+    The model is frozen and each column is a private copy of the input.
+    """
+
+    model_config = ConfigDict(extra="forbid", arbitrary_types_allowed=True, frozen=True)
+    hours: FloatColumn = Field(description="Time in hours since last use")
+    tolerance_percentage: FloatColumn = Field(description="Percentage of tolerance remaining (0-100)")
+    confidence: FloatColumn = Field(description="Confidence level in each data point (0-100)")
+
+    @model_validator(mode="before")
+    @classmethod
+    def _pack_points(cls, data):
+        if isinstance(data, (list, tuple)):
+            hours, tolerance_percentage, confidence = array("d"), array("d"), array("d")
+            # validate one point at a time and keep only its three floats
+            for p in data:
+                if not isinstance(p, ToleranceTimelinePoint):
+                    p = ToleranceTimelinePoint.model_validate(p)
+                hours.append(p.hours)
+                tolerance_percentage.append(p.tolerance_percentage)
+                confidence.append(p.confidence)
+            return {
+                "hours": hours,
+                "tolerance_percentage": tolerance_percentage,
+                "confidence": confidence,
+            }
+        return data
+
+    @model_validator(mode="after")
+    def _check_columns(self) -> ToleranceTimelineSoA:
+        if not len(self.hours) == len(self.tolerance_percentage) == len(self.confidence):
+            raise ValueError("timeline columns must have the same length")
+        # element-wise, so NaN fails the comparison just as on ToleranceTimelinePoint
+        if not all(h >= 0 for h in self.hours):
+            raise ValueError("hours must be non-negative")
+        for name in ("tolerance_percentage", "confidence"):
+            if not all(0 <= x <= 100 for x in getattr(self, name)):
+                raise ValueError(f"{name} must be within 0-100")
+        return self
+
+    def to_points(self) -> List[ToleranceTimelinePoint]:
+        """
+        Unpack into validated ToleranceTimelinePoint models.
+
+        The arrays themselves stay mutable in place, so each point is re-validated and
+        columns of unequal length raise instead of being silently truncated.
+        """
+        return [
+            ToleranceTimelinePoint(hours=h, tolerance_percentage=t, confidence=c)
+            for h, t, c in zip(self.hours, self.tolerance_percentage, self.confidence, strict=True)
+        ]
+
+
 class ToleranceBaselinePoint(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
     hours: float = Field(description="Hours for this tolerance marker")
     confidence: Percentage = Field(description="Confidence in this estimate (0-100)")
 
@@ -191,7 +319,7 @@ class ToleranceBaselines(BaseModel):
 
 
 class CrossToleranceEntry(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
     substance: str = Field(description="Name of substance with cross-tolerance")
     ratio: Ratio01 = Field(description="Approximate ratio of cross-tolerance (0-1)")
     confidence: Percentage = Field(description="Confidence in this estimate (0-100)")
@@ -219,20 +347,21 @@ class ToleranceSimple(BaseModel):
     full_tolerance: str = Field(description="Time to full tolerance.")
     half_tolerance: str = Field(description="Time to half tolerance.")
     zero_tolerance: str = Field(description="Time to zero tolerance.")
-    cross_tolerances: List[str] = Field(description="Substances with cross-tolerance.")
+    cross_tolerances: StrTuple = Field(description="Substances with cross-tolerance.")
 
 
 class Citation(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
     name: str = Field(description="The name or title of the citation.")
     reference: str = Field(description="The URL or other reference of the citation.")
 
 
 # ---------- Root model ----------
 class DrugInfo(BaseModel):
+    # No validate_assignment: records are built once and read many times. To re-check an
+    # edited record, use DrugInfo.model_validate(info.model_copy(update={...}).model_dump()).
     model_config = ConfigDict(
         extra="forbid",  # additionalProperties: false across the model
-        validate_assignment=True,
     )
 
     drug_name: str = Field(
@@ -241,11 +370,8 @@ class DrugInfo(BaseModel):
     alternative_names: List[str] = Field(
         description="A comprehensive list of alternative names for the substance, including street names, colloquialisms, chemical nomenclature variants, abbreviations, and regional terminology. This aggregation synthesizes nomenclature from diverse sources including user communities, research literature, clinical contexts, and underground markets. Includes systematic IUPAC names, common abbreviations (e.g., MDMA, LSD), brand names, research chemical designations (e.g., '5-MeO-DMT'), and vernacular terms. Sources may include trip reports, forum discussions, published literature, and drug checking services."
     )
-    search_url: Annotated[
-        HttpUrl,
-        # Negative lookahead to forbid PsychonautWiki
-        Field(pattern=r"^(?!.*psychonautwiki\.org).*"),
-    ] = Field(
+    # PsychonautWiki is rejected by _no_psychonautwiki on the parsed host.
+    search_url: HttpUrl = Field(
         description=(
             "URL to a comprehensive information repository. Must NOT be a PsychonautWiki.org URL."
         )
@@ -274,7 +400,7 @@ class DrugInfo(BaseModel):
             "ideally 5–20 concise, pertinent facts."
         )
     )
-    subjective_effects: List[str] = Field(
+    subjective_effects: StrTuple = Field(
         description="List of subjective effects aggregated from user reports and research."
     )
 
@@ -296,26 +422,87 @@ class DrugInfo(BaseModel):
     @field_validator("search_url")
     @classmethod
     def _no_psychonautwiki(cls, v: HttpUrl) -> HttpUrl:
-        host = getattr(v, "host", "")
-        if host and "psychonautwiki.org" in host.lower():
-            raise ValueError("search_url must not be a PsychonautWiki.org URL")
-        if "psychonautwiki.org" in str(v).lower():
+        # HttpUrl hands back an already lower-cased host; drop a trailing root dot
+        host = (v.host or "").rstrip(".")
+        if host in _FORBIDDEN_HOSTS or host.endswith(".psychonautwiki.org"):
             raise ValueError("search_url must not be a PsychonautWiki.org URL")
         return v
 
     @field_validator("notes")
     @classmethod
     def _notes_min_sentences(cls, v: str) -> str:
-        # crude sentence count: split on ., !, ?; count non-empty segments
-        import re
-        sentences = [s for s in re.split(r"[.!?]+", v) if s.strip()]
-        if len(sentences) < 3:
+        # crude sentence count: segments separated by ., !, ? that contain non-whitespace.
+        # Single pass without building substrings; stops as soon as 3 are seen.
+        count = 0
+        in_sentence = False
+        for ch in v:
+            if ch in _SENTENCE_TERMINATORS:
+                if in_sentence:
+                    count += 1
+                    if count >= 3:
+                        return v
+                    in_sentence = False
+            elif not in_sentence and not ch.isspace():
+                in_sentence = True
+        # a trailing segment without a terminator still counts
+        if count + in_sentence < 3:
             raise ValueError("notes must contain at least 3 sentences")
         return v
 
 
 # ---------- Helper: emit OpenAI Structured Outputs schema ----------
-def to_openai_structured_output() -> dict:
+# Keys whose values map names to subschemas; those names are not schema keywords.
+_SCHEMA_NAME_MAPS = ("properties", "$defs")
+
+
+def _strip_descriptions(node) -> None:
+    """Remove every "description" keyword from a JSON Schema, in place."""
+    if isinstance(node, dict):
+        node.pop("description", None)
+        for key, value in node.items():
+            if key in _SCHEMA_NAME_MAPS and isinstance(value, dict):
+                for sub in value.values():
+                    _strip_descriptions(sub)
+            else:
+                _strip_descriptions(value)
+    elif isinstance(node, list):
+        for item in node:
+            _strip_descriptions(item)
+
+
+@lru_cache(maxsize=2)
+def _drug_info_schema(include_descriptions: bool) -> dict:
+    schema = DrugInfo.model_json_schema()
+    if not include_descriptions:
+        _strip_descriptions(schema)
+    return schema
+
+
+@lru_cache(maxsize=2)
+def _openai_payload(include_descriptions: bool) -> dict:
+    # The schema is static; build the envelope once and hand out copies.
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "drug_info",
+            "strict": True,
+            "schema": _drug_info_schema(include_descriptions),
+        },
+    }
+
+
+def build_schema(include_descriptions: bool = True) -> dict:
+    """
+    Return the DrugInfo JSON Schema.
+
+    With include_descriptions=False every "description" keyword is stripped, giving a
+    smaller schema for runtime use; keep the default for documentation. Both variants
+    are generated once and cached; each call returns a deep copy.
+    """
+    return copy.deepcopy(_drug_info_schema(include_descriptions))
+
+
+def to_openai_structured_output(include_descriptions: bool = True) -> dict:
     """
     Build the exact response_format payload for OpenAI Structured Outputs.
 
@@ -328,12 +515,37 @@ def to_openai_structured_output() -> dict:
              "schema": <DrugInfo JSON Schema Draft 2020-12>
           }
         }
+
+    Pass include_descriptions=False to drop field descriptions from the schema and shrink
+    the payload; note that the descriptions are also guidance for the model.
+
+    The schema is generated once and cached; each call returns a deep copy, so callers
+    may mutate the result freely.
     """
-    return {
-        "type": "json_schema",
-        "json_schema": {
-            "name": "drug_info",
-            "strict": True,
-            "schema": DrugInfo.model_json_schema(),
-        },
-    }
+    return copy.deepcopy(_openai_payload(include_descriptions))
+
+
+@lru_cache(maxsize=2)
+def _openai_payload_bytes(include_descriptions: bool) -> bytes:
+    return pydantic_core.to_json(_openai_payload(include_descriptions))
+
+
+def to_openai_structured_output_bytes(include_descriptions: bool = True) -> bytes:
+    """
+    Same payload as to_openai_structured_output(), pre-serialized to compact JSON bytes.
+
+    Encoded once per variant and cached; bytes are immutable, so the cached object is
+    returned directly. Suitable for splicing into a request body without re-encoding.
+    """
+    return _openai_payload_bytes(include_descriptions)
+
+
+# ---------- Helper: bulk validation ----------
+# One adapter for a whole batch: pydantic-core validates the array in a single call
+# instead of re-entering DrugInfo.model_validate once per record.
+DRUG_INFO_ADAPTER: TypeAdapter[List[DrugInfo]] = TypeAdapter(List[DrugInfo])
+
+
+def validate_batch_json(raw: str | bytes) -> List[DrugInfo]:
+    """Parse and validate a JSON array of DrugInfo records in one pass."""
+    return DRUG_INFO_ADAPTER.validate_json(raw)